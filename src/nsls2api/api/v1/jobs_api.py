@@ -1,5 +1,6 @@
 from typing import Optional
 import bson
+import bson.errors
 import fastapi
 from fastapi import Depends, Request
 
@@ -27,14 +28,22 @@ async def check_job_status(request: Request, job_id: str):
     :return: The status of the job.
     """
 
-    job = await background_service.job_by_id(bson.ObjectId(job_id))
-    if job is None:
+    try:
+        job_object_id = bson.ObjectId(job_id)
+    except bson.errors.InvalidId:
+        return fastapi.responses.JSONResponse(
+            {"error": f"{job_id} is not a valid job ID"},
+            status_code=fastapi.status.HTTP_400_BAD_REQUEST,
+        )
+
+    job_status = await background_service.job_status(job_object_id)
+    if job_status is None:
         return fastapi.responses.JSONResponse(
             {"error": f"Job {job_id} not found"},
             status_code=fastapi.status.HTTP_404_NOT_FOUND,
         )
     else:
-        return job.processing_status
+        return job_status
 
 
 @router.get(
@@ -53,7 +62,9 @@ async def sync_proposal(request: Request, proposal_id: int) -> BackgroundJob:
 
 
 @router.get("/sync/proposal/types/{facility}", include_in_schema=SYNC_ROUTES_IN_SCHEMA, tags=["sync"])
-async def sync_proposal_types(facility: FacilityName = FacilityName.nsls2):
+async def sync_proposal_types(
+    facility: FacilityName = FacilityName.nsls2,
+) -> BackgroundJob:
     sync_params = JobSyncParameters(facility=facility)
     job = await background_service.create_background_job(
         JobActions.synchronize_proposal_types,
@@ -78,7 +89,7 @@ async def sync_proposals_for_cycle(request: Request, cycle: str) -> BackgroundJo
 
 
 @router.get("/sync/cycles/{facility}", include_in_schema=SYNC_ROUTES_IN_SCHEMA, tags=["sync"])
-async def sync_cycles(facility: FacilityName = FacilityName.nsls2):
+async def sync_cycles(facility: FacilityName = FacilityName.nsls2) -> BackgroundJob:
     sync_params = JobSyncParameters(facility=facility)
     job = await background_service.create_background_job(
         JobActions.synchronize_cycles,
@@ -92,7 +103,7 @@ async def sync_update_cycles(
     request: fastapi.Request,
     facility: FacilityName = FacilityName.nsls2,
     cycle: Optional[str] = None,
-):
+) -> BackgroundJob:
     sync_params = JobSyncParameters(
         facility=facility, cycle=cycle, sync_source=JobSyncSource.PASS
     )
@@ -1,5 +1,5 @@
 import asyncio
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from nsls2api.infrastructure import mongodb_setup
 from nsls2api.infrastructure.config import get_settings
@@ -27,12 +27,16 @@ async def app_lifespan(_):
     # Create a shared httpx client
     httpx_client_wrapper.start()
 
-    # Start the background workers
-
-    # noinspection PyAsyncCall
-    asyncio.create_task(background_service.worker_function())
+    # Start the background workers, keeping a reference to the task so that it
+    # isn't garbage collected and can be cancelled cleanly on shutdown.
+    background_worker = asyncio.create_task(background_service.worker_function())
 
     yield
 
+    # Stop the background workers
+    background_worker.cancel()
+    with suppress(asyncio.CancelledError):
+        await background_worker
+
     # Cleanup httpx client
     await httpx_client_wrapper.stop()
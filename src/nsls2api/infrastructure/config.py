@@ -21,6 +21,7 @@ class Settings(BaseSettings):
     n2sn_user_search (str): The search query for user information in N2SN.
     n2sn_group_search (str): The search query for group information in N2SN.
     bnlroot_ca_certs_file (str): The file path for the BNL root CA certificates.
+    pass_sync_concurrency (int): The maximum number of proposals (or cycles) synchronized from PASS at the same time. Defaults to 10.
 
     model_config (SettingsConfigDict): An instance of the `SettingsConfigDict` class, used for loading settings from an environment file (".env").
 
@@ -52,6 +53,9 @@ class Settings(BaseSettings):
     use_socks_proxy: bool = False
     socks_proxy: str
 
+    # Maximum number of proposals (or cycles) to synchronize from PASS concurrently
+    pass_sync_concurrency: int = 10
+
     # Slack settings
     slack_bot_token: str | None = ""
     superadmin_slack_user_token: str | None = ""
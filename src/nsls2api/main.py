@@ -5,6 +5,7 @@ import fastapi
 import uvicorn
 from asgi_correlation_id import CorrelationIdMiddleware
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from starlette.middleware import Middleware
 from starlette.staticfiles import StaticFiles
 
@@ -38,7 +39,10 @@ app_setup.local_development_mode = local_development_mode
 middleware = [Middleware(ProcessTimeMiddleware)]
 
 app = fastapi.FastAPI(
-    title="NSLS-II API", middleware=middleware, lifespan=app_setup.app_lifespan
+    title="NSLS-II API",
+    middleware=middleware,
+    lifespan=app_setup.app_lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -120,6 +120,14 @@ class SlackChannelManagersView(pydantic.BaseModel):
         projection = {"slack_channel_managers": "$slack_channel_managers"}
 
 
+class BeamlinePassIdView(pydantic.BaseModel):
+    name: str
+    pass_id: Optional[str] = None
+
+    class Settings:
+        projection = {"name": "$name", "pass_id": "$pass_id"}
+
+
 class EndStation(pydantic.BaseModel):
     name: str
     service_accounts: Optional[ServiceAccounts] = None
@@ -1,5 +1,6 @@
 import asyncio
 import datetime
+import time
 import traceback
 from typing import Optional
 
@@ -9,6 +10,11 @@ from nsls2api.infrastructure.logging import logger
 from nsls2api.models.jobs import BackgroundJob, JobActions, JobStatus, JobSyncParameters
 from nsls2api.services import sync_service 
 
+# Finished jobs can no longer change status, so remember their status for a
+# while to save a database round trip each time a client polls for it.
+FINISHED_JOB_STATUS_TTL_SECONDS = 300
+_finished_job_status_cache: dict[bson.ObjectId, tuple[str, float]] = {}
+
 
 async def create_background_job(
     action: JobActions, sync_parameters: JobSyncParameters = None
@@ -74,6 +80,39 @@ async def job_by_id(job_id: bson.ObjectId) -> Optional[BackgroundJob]:
     return await BackgroundJob.find_one(BackgroundJob.id == job_id)
 
 
+async def job_status(job_id: bson.ObjectId) -> Optional[str]:
+    """
+    Return the processing status of a job.
+
+    :param job_id: The ID of the job.
+    :return: The processing status of the job, or None if no job is found.
+    """
+    now = time.monotonic()
+
+    cached = _finished_job_status_cache.get(job_id)
+    if cached is not None and cached[1] > now:
+        return cached[0]
+
+    job: Optional[BackgroundJob] = await job_by_id(job_id)
+    if not job:
+        return None
+
+    if job.is_finished:
+        # Drop any expired entries so the cache doesn't grow without bound.
+        for expired_id in [
+            key
+            for key, (_, expires) in _finished_job_status_cache.items()
+            if expires <= now
+        ]:
+            del _finished_job_status_cache[expired_id]
+        _finished_job_status_cache[job_id] = (
+            job.processing_status,
+            now + FINISHED_JOB_STATUS_TTL_SECONDS,
+        )
+
+    return job.processing_status
+
+
 async def is_job_finished(job_id: bson.ObjectId) -> bool:
     job: Optional[BackgroundJob] = await job_by_id(job_id)
     if not job:
@@ -152,4 +191,8 @@ async def worker_function():
         except Exception as e:
             logger.exception(f"Error processing job {job.id} for {job.action}: {e}")
             error_message = traceback.format_exc()
-            await complete_job(job.id, JobStatus.failed, error_message)
+            try:
+                await complete_job(job.id, JobStatus.failed, error_message)
+            except Exception as error:
+                # Don't let a failure to record the job status stop the worker.
+                logger.exception(f"Error marking job {job.id} as failed: {error}")
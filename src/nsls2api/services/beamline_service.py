@@ -9,6 +9,7 @@ from nsls2api.api.models.beamline_model import AssetDirectoryGranularity
 from nsls2api.infrastructure.logging import logger
 from nsls2api.models.beamlines import (
     Beamline,
+    BeamlinePassIdView,
     BeamlineService,
     Detector,
     DetectorView,
@@ -59,6 +60,23 @@ async def beamline_by_pass_id(pass_id: str) -> Optional[Beamline]:
     return beamline
 
 
+async def beamline_names_by_pass_id() -> dict[str, str]:
+    """
+    Return a mapping of PASS ID to beamline name for all beamlines that have a PASS ID.
+
+    This lets callers that need to resolve many PASS resources (e.g. when
+    synchronizing proposals) do so with a single query.
+
+    :return: A dictionary of beamline names keyed by PASS ID.
+    """
+    beamlines = await Beamline.find_all().project(BeamlinePassIdView).to_list()
+    return {
+        beamline.pass_id: beamline.name
+        for beamline in beamlines
+        if beamline.pass_id is not None
+    }
+
+
 async def all_services(name: str) -> Optional[ServicesOnly]:
     beamline_services = await Beamline.find_one(Beamline.name == name.upper()).project(
         ServicesOnly
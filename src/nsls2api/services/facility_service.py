@@ -49,6 +49,22 @@ async def facility_by_pass_id(pass_user_facility_id: str) -> Optional[Facility]:
     return await Facility.find_one(Facility.pass_facility_id == pass_user_facility_id)
 
 
+async def facilities_by_pass_id() -> dict[str, Facility]:
+    """
+    Facilities by PASS ID
+
+    This method retrieves all the facilities that have a PASS ID in a single query.
+
+    :return: A dictionary of facilities (Facility) keyed by their PASS ID (str).
+    """
+    facilities = await Facility.find_all().to_list()
+    return {
+        facility.pass_facility_id: facility
+        for facility in facilities
+        if facility.pass_facility_id is not None
+    }
+
+
 async def pass_id_for_facility(facility_name: str) -> Optional[str]:
     """
     PASS ID for Facility
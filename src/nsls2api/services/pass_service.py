@@ -20,7 +20,8 @@ from nsls2api.services.helpers import _call_async_webservice_with_client
 settings = config.get_settings()
 
 api_key = settings.pass_api_key
-base_url = settings.pass_api_url
+# Convert the URL to a string once here, rather than every time a request URL is built.
+base_url = str(settings.pass_api_url)
 
 
 class PassException(Exception):
@@ -45,7 +46,7 @@ async def get_proposal(
 
     try:
         pass_proposal = await _call_pass_webservice(url)
-        proposal = PassProposal(**pass_proposal)
+        proposal = PassProposal.model_validate(pass_proposal)
     except ValidationError as error:
         error_message = (
             f"Error validating data recevied from PASS for proposal {proposal_id}."
@@ -74,10 +75,10 @@ async def get_proposal_types(
 
     try:
         pass_proposal_types_list = await _call_pass_webservice(url)
-        proposal_types = []
-        if pass_proposal_types_list and len(pass_proposal_types_list) > 0:
-            for proposal_type in pass_proposal_types_list:
-                proposal_types.append(PassProposalType(**proposal_type))
+        proposal_types = [
+            PassProposalType.model_validate(proposal_type)
+            for proposal_type in pass_proposal_types_list or []
+        ]
     except ValidationError as error:
         error_message = f"Error validating data recevied from PASS for proposal type for the {facility} facility."
         logger.error(error_message)
@@ -103,10 +104,7 @@ async def get_saf_from_proposal(
     url = f"{base_url}/SAF/GetSAFsByProposal/{api_key}/{pass_facility}/{proposal_id}"
     try:
         pass_saf_list = await _call_pass_webservice(url)
-        saf_list = []
-        if pass_saf_list and len(pass_saf_list) > 0:
-            for saf in pass_saf_list:
-                saf_list.append(PassSaf(**saf))
+        saf_list = [PassSaf.model_validate(saf) for saf in pass_saf_list or []]
     except ValidationError as error:
         error_message = (
             f"Error validating SAF data recevied from PASS for proposal {proposal_id}."
@@ -134,10 +132,10 @@ async def get_commissioning_proposals_by_year(year: int, facility: FacilityName
 
     try:
         pass_commissioning_proposals = await _call_pass_webservice(url)
-        commissioning_proposal_list = []
-        if pass_commissioning_proposals and len(pass_commissioning_proposals) > 0:
-            for commissioning_proposal in pass_commissioning_proposals:
-                commissioning_proposal_list.append(PassProposal(**commissioning_proposal))
+        commissioning_proposal_list = [
+            PassProposal.model_validate(commissioning_proposal)
+            for commissioning_proposal in pass_commissioning_proposals or []
+        ]
     except ValidationError as error:
         error_message = f"Error validating commissioning proposal data recevied from PASS for year {str(year)} at {facility} facility."
         logger.error(error_message)
@@ -171,10 +169,7 @@ async def get_cycles(
 
     try:
         pass_cycle_list = await _call_pass_webservice(url)
-        cycles = []
-        if pass_cycle_list and len(pass_cycle_list) > 0:
-            for cycle in pass_cycle_list:
-                cycles.append(PassCycle(**cycle))
+        cycles = [PassCycle.model_validate(cycle) for cycle in pass_cycle_list or []]
     except ValidationError as error:
         error_message = f"Error validating cycle data recevied from PASS for the {facility} facility."
         logger.error(error_message)
@@ -206,10 +201,10 @@ async def get_proposals_allocated_by_cycle(
 
     try:
         pass_allocated_proposals = await _call_pass_webservice(url)
-        allocated_proposals = []
-        if pass_allocated_proposals and len(pass_allocated_proposals) > 0:
-            for allocation in pass_allocated_proposals:
-                allocated_proposals.append(PassAllocation(**allocation))
+        allocated_proposals = [
+            PassAllocation.model_validate(allocation)
+            for allocation in pass_allocated_proposals or []
+        ]
     except ValidationError as error:
         error_message = f"Error validating allocated proposal data recevied from PASS for the {cycle} cycle at {facility} facility."
         logger.error(error_message)
@@ -236,10 +231,10 @@ async def get_proposals_allocated(
 
     try:
         pass_allocated_proposals = await _call_pass_webservice(url)
-        allocated_proposals = []
-        if pass_allocated_proposals and len(pass_allocated_proposals) > 0:
-            for allocation in pass_allocated_proposals:
-                allocated_proposals.append(PassAllocation(**allocation))
+        allocated_proposals = [
+            PassAllocation.model_validate(allocation)
+            for allocation in pass_allocated_proposals or []
+        ]
     except ValidationError as error:
         error_message = f"Error validating allocated proposal data recevied from PASS at {facility} facility."
         logger.error(error_message)
@@ -254,6 +249,6 @@ async def get_proposals_allocated(
 
 async def get_proposals_by_person(bnl_id: str):
     url = f"{base_url}/Proposal/GetProposalsByPerson/{api_key}/NSLS-II/null/null/{bnl_id}/null"
-    print(url)
+    logger.debug(f"Getting proposals from PASS for BNL ID {bnl_id}.")
     proposals = await _call_pass_webservice(url)
     return proposals
@@ -1,20 +1,120 @@
+import asyncio
 import datetime
 from typing import Optional
 
-from beanie import UpdateResponse
-from beanie.operators import AddToSet, Set
+from beanie import Document, UpdateResponse
+from beanie.odm.utils.dump import get_dict
+from beanie.operators import AddToSet, In, Set
 from httpx import HTTPStatusError
+from pymongo import UpdateOne
 
 from nsls2api.api.models.facility_model import FacilityName
+from nsls2api.infrastructure import config
 from nsls2api.models.pass_models import PassCycle
 from nsls2api.services import beamline_service, bnlpeople_service, facility_service, pass_service, proposal_service
 
 from nsls2api.infrastructure.logging import logger
 from nsls2api.models.cycles import Cycle
 from nsls2api.models.jobs import JobSyncSource
-from nsls2api.models.pass_models import PassProposal, PassSaf
+from nsls2api.models.pass_models import PassProposal, PassProposalType, PassResource
 from nsls2api.models.proposal_types import ProposalType
-from nsls2api.models.proposals import Proposal, SafetyForm, User
+from nsls2api.models.proposals import Proposal, ProposalIdView, SafetyForm, User
+
+settings = config.get_settings()
+
+
+def _cached_lookup(
+    cache: dict,
+    key,
+    lookup,
+    cached_errors: tuple[type[BaseException], ...] = (),
+) -> asyncio.Future:
+    """
+    Return the lookup for the given key, only starting it if it isn't already in the cache.
+
+    The pending lookup itself is cached so that concurrent callers asking for the
+    same key share a single request. If the lookup fails with an error that isn't
+    one of `cached_errors` (e.g. a transient network error) it is removed from the
+    cache, so that later callers try again rather than getting the same error.
+
+    :param cache: The cache to use, this only needs to live as long as the sync.
+    :param key: The key to look up (e.g. a PASS ID).
+    :param lookup: The coroutine function that performs the lookup.
+    :param cached_errors: The errors that are permanent enough to be cached.
+    :return: An awaitable that resolves to the result of the lookup.
+    """
+    if key not in cache:
+        future = asyncio.ensure_future(lookup(key))
+
+        def _evict_on_error(done: asyncio.Future) -> None:
+            if done.cancelled() or (
+                done.exception() is not None
+                and not isinstance(done.exception(), cached_errors)
+            ):
+                if cache.get(key) is done:
+                    del cache[key]
+
+        future.add_done_callback(_evict_on_error)
+        cache[key] = future
+    return cache[key]
+
+
+def _beamline_names_for_resources(
+    resources: list[PassResource], beamline_names: dict[str, str]
+) -> list[str]:
+    """
+    Return the names of the beamlines that correspond to the given PASS resources.
+
+    :param resources: The resources as returned from PASS.
+    :param beamline_names: A mapping of PASS ID to beamline name.
+    :return: The names of the beamlines, resources that aren't beamlines are skipped.
+    """
+    return [
+        beamline_names[str(resource.ID)]
+        for resource in resources
+        if str(resource.ID) in beamline_names
+    ]
+
+
+def _upsert_operation(filter: dict, update: dict, on_insert: Document) -> UpdateOne:
+    """
+    Build an upsert operation for use with `bulk_write()`.
+
+    This mirrors Beanie's `find_one(...).upsert(Set(update), on_insert=...)`, the
+    fields in `update` are always set and the remaining fields of the `on_insert`
+    document are only written if a new document is created.
+
+    :param filter: The query used to find the existing document.
+    :param update: The fields to set on the document.
+    :param on_insert: The document to insert if there is no existing document.
+    :return: The upsert operation.
+    """
+    # The filter fields are added to an inserted document by MongoDB itself
+    insert_only = get_dict(on_insert, to_db=True, exclude=set(update) | set(filter))
+    return UpdateOne(
+        filter, {"$set": update, "$setOnInsert": insert_only}, upsert=True
+    )
+
+
+async def synchronize_cycle_proposals_from_pass(
+    cycle_name: str, last_updated: Optional[datetime.datetime] = None
+) -> None:
+    """
+    This method updates the list of proposals allocated to a cycle from PASS.
+
+    :param cycle_name: The name of the cycle (str).
+    :param last_updated: The time to record as the cycle's last update, defaults to now.
+    """
+    if last_updated is None:
+        last_updated = datetime.datetime.now()
+
+    proposals_list = await pass_service.get_proposals_allocated_by_cycle(cycle_name)
+    proposal_ids = [str(proposal.Proposal_ID) for proposal in proposals_list]
+    if proposal_ids:
+        await Cycle.find_one(Cycle.name == cycle_name).update(
+            AddToSet({Cycle.proposals: {"$each": proposal_ids}}),
+            Set({Cycle.last_updated: last_updated}),
+        )
 
 
 async def worker_synchronize_cycles_from_pass(
@@ -28,16 +128,17 @@ async def worker_synchronize_cycles_from_pass(
     start_time = datetime.datetime.now()
 
     try:
-        pass_cycles: PassCycle = await pass_service.get_cycles(facility_name)
+        pass_cycles: list[PassCycle] = await pass_service.get_cycles(facility_name)
     except pass_service.PassException as error:
         error_message = f"Error retrieving cycle information from PASS for {facility_name} facility."
         logger.exception(error_message)
         raise Exception(error_message) from error
 
+    facilities = await facility_service.facilities_by_pass_id()
+
+    cycle_upserts = []
     for pass_cycle in pass_cycles:
-        facility = await facility_service.facility_by_pass_id(
-            pass_cycle.User_Facility_ID
-        )
+        facility = facilities.get(pass_cycle.User_Facility_ID)
 
         logger.info(f"Synchronizing cycle: {pass_cycle.Name} for {facility.name}.")
 
@@ -50,10 +151,13 @@ async def worker_synchronize_cycles_from_pass(
             end_date=pass_cycle.End_Date,
             pass_description=pass_cycle.Description,
             pass_id=str(pass_cycle.ID),
+            created_on=start_time,
+            last_updated=start_time,
         )
 
-        updated_cycle = await Cycle.find_one(Cycle.name == pass_cycle.Name).upsert(
-            Set(
+        cycle_upserts.append(
+            _upsert_operation(
+                {Cycle.name: cycle.name},
                 {
                     Cycle.accepting_proposals: cycle.accepting_proposals,
                     Cycle.facility: cycle.facility,
@@ -62,25 +166,50 @@ async def worker_synchronize_cycles_from_pass(
                     Cycle.year: cycle.year,
                     Cycle.start_date: cycle.start_date,
                     Cycle.end_date: cycle.end_date,
-                    Cycle.last_updated: datetime.datetime.now(),
-                }
-            ),
-            on_insert=cycle,
-            response_type=UpdateResponse.NEW_DOCUMENT,
+                    Cycle.last_updated: start_time,
+                },
+                on_insert=cycle,
+            )
+        )
+
+    # Upsert all the cycles in a single round trip
+    if cycle_upserts:
+        response = await Cycle.get_motor_collection().bulk_write(
+            cycle_upserts, ordered=False
         )
+        logger.debug(f"Response: {response.bulk_api_result}")
 
-        # Now let's update the list of proposals for this cycle
-        proposals_list = await pass_service.get_proposals_allocated_by_cycle(cycle.name)
-        for proposal in proposals_list:
-            await updated_cycle.update(
-                AddToSet({Cycle.proposals: str(proposal.Proposal_ID)})
+    # Now let's update the list of proposals for each cycle, the cycles are
+    # independent of each other so do this concurrently.
+    semaphore = asyncio.Semaphore(settings.pass_sync_concurrency)
+
+    async def _synchronize(pass_cycle: PassCycle) -> None:
+        async with semaphore:
+            await synchronize_cycle_proposals_from_pass(pass_cycle.Name, start_time)
+
+    # Let every cycle finish before reporting failures, so that no updates are
+    # still running once this job is marked as failed.
+    results = await asyncio.gather(
+        *(_synchronize(pass_cycle) for pass_cycle in pass_cycles),
+        return_exceptions=True,
+    )
+
+    failed_cycles = []
+    for pass_cycle, result in zip(pass_cycles, results):
+        if isinstance(result, BaseException):
+            logger.error(
+                f"Error synchronizing proposals for cycle {pass_cycle.Name}: {result}"
             )
-            updated_cycle.last_updated = datetime.datetime.now()
-            await updated_cycle.save()
+            failed_cycles.append(pass_cycle.Name)
+
+    if failed_cycles:
+        raise Exception(
+            f"Failed to synchronize proposals for {len(failed_cycles)} cycles (for {facility_name}): {failed_cycles}"
+        )
 
     time_taken = datetime.datetime.now() - start_time
     logger.info(
-        f"Cycle information (for {facility.name}) synchronized in {time_taken.total_seconds():,.2f} seconds"
+        f"Cycle information (for {facility_name}) synchronized in {time_taken.total_seconds():,.2f} seconds"
     )
 
 
@@ -90,9 +219,9 @@ async def worker_synchronize_proposal_types_from_pass(
     start_time = datetime.datetime.now()
 
     try:
-        pass_proposal_types: PassProposal = await pass_service.get_proposal_types(
-            facility_name
-        )
+        pass_proposal_types: list[
+            PassProposalType
+        ] = await pass_service.get_proposal_types(facility_name)
     except pass_service.PassException as error:
         error_message = (
             f"Error retrieving proposal types from PASS for {facility_name} facility."
@@ -100,10 +229,11 @@ async def worker_synchronize_proposal_types_from_pass(
         logger.exception(error_message)
         raise Exception(error_message) from error
 
+    facilities = await facility_service.facilities_by_pass_id()
+
+    proposal_type_upserts = []
     for pass_proposal_type in pass_proposal_types:
-        facility = await facility_service.facility_by_pass_id(
-            pass_proposal_type.User_Facility_ID
-        )
+        facility = facilities.get(pass_proposal_type.User_Facility_ID)
 
         proposal_type = ProposalType(
             code=pass_proposal_type.Code,
@@ -111,52 +241,63 @@ async def worker_synchronize_proposal_types_from_pass(
             pass_id=str(pass_proposal_type.ID),
             description=pass_proposal_type.Description,
             pass_description=pass_proposal_type.Description,
+            created_on=start_time,
+            last_updated=start_time,
         )
 
-        response = await ProposalType.find_one(
-            ProposalType.pass_id == str(pass_proposal_type.ID)
-        ).upsert(
-            Set(
+        proposal_type_upserts.append(
+            _upsert_operation(
+                {ProposalType.pass_id: str(pass_proposal_type.ID)},
                 {
                     ProposalType.code: pass_proposal_type.Code,
                     ProposalType.pass_description: pass_proposal_type.Description,
                     ProposalType.description: pass_proposal_type.Description,
                     ProposalType.facility_id: facility.facility_id,
-                    ProposalType.last_updated: datetime.datetime.now(),
-                }
-            ),
-            on_insert=proposal_type,
-            response_type=UpdateResponse.UPDATE_RESULT,
+                    ProposalType.last_updated: start_time,
+                },
+                on_insert=proposal_type,
+            )
         )
 
+    # Upsert all the proposal types in a single round trip
+    if proposal_type_upserts:
+        response = await ProposalType.get_motor_collection().bulk_write(
+            proposal_type_upserts, ordered=False
+        )
+        logger.debug(f"Response: {response.bulk_api_result}")
+
     time_taken = datetime.datetime.now() - start_time
-    logger.debug(f"Response: {response}")
     logger.info(
-        f"Proposal type information (for {facility.name}) synchronized in {time_taken.total_seconds():,.2f} seconds"
+        f"Proposal type information (for {facility_name}) synchronized in {time_taken.total_seconds():,.2f} seconds"
     )
 
 
-async def synchronize_proposal_from_pass(proposal_id: int) -> None:
-    beamline_list = []
+async def synchronize_proposal_from_pass(
+    proposal_id: int,
+    beamline_names: Optional[dict[str, str]] = None,
+    username_cache: Optional[dict] = None,
+) -> None:
+    if beamline_names is None:
+        beamline_names = await beamline_service.beamline_names_by_pass_id()
+    if username_cache is None:
+        username_cache = {}
+
     user_list = []
     saf_list = []
 
+    # The proposal and its SAFs are independent PASS calls, so fetch them together.
     try:
-        pass_proposal: PassProposal = await pass_service.get_proposal(proposal_id)
+        pass_proposal, pass_saf_list = await asyncio.gather(
+            pass_service.get_proposal(proposal_id),
+            pass_service.get_saf_from_proposal(proposal_id),
+        )
     except pass_service.PassException as error:
         error_message = f"Error retrieving proposal {proposal_id} from PASS"
         logger.exception(error_message)
         raise Exception(error_message) from error
 
-    # Get the SAFs for this proposal
-    pass_saf_list: list[PassSaf] = await pass_service.get_saf_from_proposal(proposal_id)
     for saf in pass_saf_list:
-        saf_beamline_list = []
-        for resource in saf.Resources:
-            beamline = await beamline_service.beamline_by_pass_id(resource.ID)
-            if beamline:
-                saf_beamline_list.append(beamline.name)
-
+        saf_beamline_list = _beamline_names_for_resources(saf.Resources, beamline_names)
         saf_list.append(
             SafetyForm(
                 saf_id=str(saf.SAF_ID), status=saf.Status, instruments=saf_beamline_list
@@ -164,38 +305,65 @@ async def synchronize_proposal_from_pass(proposal_id: int) -> None:
         )
 
     # Get the beamlines for this proposal and add them
-    for resource in pass_proposal.Resources:
-        beamline = await beamline_service.beamline_by_pass_id(resource.ID)
-        if beamline:
-            beamline_list.append(beamline.name)
+    beamline_list = _beamline_names_for_resources(
+        pass_proposal.Resources, beamline_names
+    )
 
     pi_found_in_experimenters = False
 
+    if pass_proposal.PI is None:
+        if pass_proposal.Experimenters:
+            logger.warning(f"Proposal {proposal_id} does not have a PI.")
+        experimenters = []
+    else:
+        experimenters = pass_proposal.Experimenters
+
+    # Look up the BNL username for everyone on the proposal concurrently. The PI is
+    # included as PASS doesn't always list them as an experimenter, and each
+    # distinct person is only looked up once. A failure for one person should not
+    # stop the rest of the proposal from syncing.
+    bnl_ids = {user.BNL_ID for user in experimenters}
+    if pass_proposal.PI:
+        bnl_ids.add(pass_proposal.PI.BNL_ID)
+    bnl_ids = list(bnl_ids)
+
+    lookup_results = await asyncio.gather(
+        *(
+            _cached_lookup(
+                username_cache,
+                bnl_id,
+                bnlpeople_service.get_username_by_id,
+                cached_errors=(HTTPStatusError,),
+            )
+            for bnl_id in bnl_ids
+        ),
+        return_exceptions=True,
+    )
+
+    bnl_usernames = {}
+    for bnl_id, bnl_username in zip(bnl_ids, lookup_results):
+        if isinstance(bnl_username, HTTPStatusError):
+            logger.error(f"Could not find BNL username for BNL ID '{bnl_id}'.")
+            logger.error(f"BNL People API returned: {bnl_username}")
+            bnl_username = None
+        elif isinstance(bnl_username, BaseException):
+            raise bnl_username
+        bnl_usernames[bnl_id] = bnl_username
+
     # Get the users for this proposal
-    for user in pass_proposal.Experimenters:
+    for user in experimenters:
         user_is_pi = False
-        bnl_username = None
 
-        if pass_proposal.PI is None:
-            logger.warning(f"Proposal {proposal_id} does not have a PI.")
-            continue
-        else:
-            if str(pass_proposal.PI.BNL_ID).casefold() == str(user.BNL_ID).casefold():
-                user_is_pi = True
-                pi_found_in_experimenters = True
-        try:
-            bnl_username = await bnlpeople_service.get_username_by_id(user.BNL_ID)
-        except HTTPStatusError as error:
-            logger.error(f"Could not find BNL username for BNL ID '{user.BNL_ID}'.")
-            logger.error(f"BNL People API returned: {error}")
-            bnl_username = None
+        if str(pass_proposal.PI.BNL_ID).casefold() == str(user.BNL_ID).casefold():
+            user_is_pi = True
+            pi_found_in_experimenters = True
 
         userinfo = User(
             first_name=user.First_Name,
             last_name=user.Last_Name,
             email=user.Email,
             bnl_id=user.BNL_ID,
-            username=bnl_username,
+            username=bnl_usernames[user.BNL_ID],
             is_pi=user_is_pi,
         )
         user_list.append(userinfo)
@@ -203,21 +371,21 @@ async def synchronize_proposal_from_pass(proposal_id: int) -> None:
     # Let's add the PI explictly anyway as PASS sometimes includes the PI in the
     # Experimenters list and sometimes not.
     if pass_proposal.PI and not pi_found_in_experimenters:
-        bnl_username = await bnlpeople_service.get_username_by_id(
-            pass_proposal.PI.BNL_ID
-        )
         pi_info = User(
             first_name=pass_proposal.PI.First_Name,
             last_name=pass_proposal.PI.Last_Name,
             email=pass_proposal.PI.Email,
             bnl_id=pass_proposal.PI.BNL_ID,
-            username=bnl_username,
+            username=bnl_usernames[pass_proposal.PI.BNL_ID],
             is_pi=True,
         )
         user_list.append(pi_info)
 
     data_session = proposal_service.generate_data_session_for_proposal(proposal_id)
 
+    # Use the same timestamp for the update and for a newly inserted proposal
+    now = datetime.datetime.now()
+
     proposal = Proposal(
         proposal_id=str(pass_proposal.Proposal_ID),
         title=pass_proposal.Title,
@@ -227,7 +395,8 @@ async def synchronize_proposal_from_pass(proposal_id: int) -> None:
         instruments=beamline_list,
         safs=saf_list,
         users=user_list,
-        last_updated=datetime.datetime.now(),
+        created_on=now,
+        last_updated=now,
     )
 
     response = await Proposal.find_one(Proposal.proposal_id == str(proposal_id)).upsert(
@@ -240,7 +409,7 @@ async def synchronize_proposal_from_pass(proposal_id: int) -> None:
                 Proposal.instruments: beamline_list,
                 Proposal.safs: saf_list,
                 Proposal.users: user_list,
-                Proposal.last_updated: datetime.datetime.now(),
+                Proposal.last_updated: now,
             }
         ),
         on_insert=proposal,
@@ -261,16 +430,22 @@ async def update_proposals_with_cycle(cycle_name: str) -> None:
 
     logger.info(f"Found {len(proposal_list)} proposals for cycle {cycle_name}.")
 
-    for proposal_id in proposal_list:
-        # Add the cycle to the Proposal object
-
-        try:
-            proposal = await proposal_service.proposal_by_id(int(proposal_id))
-            await proposal.update(AddToSet({Proposal.cycles: cycle_name}))
-            proposal.last_updated = datetime.datetime.now()
-            await proposal.save()
-        except LookupError as error:
-            logger.warning(error)
+    proposal_ids = [str(proposal_id) for proposal_id in proposal_list]
+
+    # Warn about any proposals in the cycle that we don't know about
+    existing_proposals = await Proposal.find(
+        In(Proposal.proposal_id, proposal_ids)
+    ).project(ProposalIdView).to_list()
+    existing_proposal_ids = {proposal.proposal_id for proposal in existing_proposals}
+    for proposal_id in proposal_ids:
+        if proposal_id not in existing_proposal_ids:
+            logger.warning(f"Could not find a proposal with an ID of {proposal_id}")
+
+    # Add the cycle to all the Proposal objects at once
+    await Proposal.find(In(Proposal.proposal_id, proposal_ids)).update(
+        AddToSet({Proposal.cycles: cycle_name}),
+        Set({Proposal.last_updated: datetime.datetime.now()}),
+    )
 
 
 async def worker_synchronize_proposal_from_pass(proposal_id: int) -> None:
@@ -284,27 +459,73 @@ async def worker_synchronize_proposal_from_pass(proposal_id: int) -> None:
     )
 
 
+async def synchronize_proposals_from_pass(proposal_ids: list[int]) -> list[int]:
+    """
+    Synchronize a number of proposals from PASS concurrently.
+
+    The number of proposals being synchronized at any one time is capped by the
+    `pass_sync_concurrency` setting so that we don't overwhelm PASS or BNL People.
+
+    :param proposal_ids: The IDs of the proposals to synchronize.
+    :type proposal_ids: list[int]
+    :return: The IDs of any proposals that failed to synchronize.
+    """
+    semaphore = asyncio.Semaphore(settings.pass_sync_concurrency)
+
+    # Beamlines and people (e.g. PIs) are shared between many proposals, so only
+    # look each one up once.
+    beamline_names = await beamline_service.beamline_names_by_pass_id()
+    username_cache = {}
+
+    async def _synchronize(proposal_id: int) -> None:
+        async with semaphore:
+            logger.info(f"Synchronizing proposal {proposal_id}.")
+            await synchronize_proposal_from_pass(
+                proposal_id, beamline_names, username_cache
+            )
+
+    results = await asyncio.gather(
+        *(_synchronize(proposal_id) for proposal_id in proposal_ids),
+        return_exceptions=True,
+    )
+
+    failed_proposals = []
+    for proposal_id, result in zip(proposal_ids, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Error synchronizing proposal {proposal_id}: {result}")
+            failed_proposals.append(proposal_id)
+
+    return failed_proposals
+
+
 async def worker_synchronize_proposals_for_cycle_from_pass(cycle: str) -> None:
     start_time = datetime.datetime.now()
 
     cycle_year = await facility_service.cycle_year(cycle)
 
     proposals = await proposal_service.fetch_proposals_for_cycle(cycle)
-    logger.info(f"Synchronizing {len(proposals)} proposals for {cycle} cycle.")
 
-    for proposal_id in proposals:
-        logger.info(f"Synchronizing proposal {proposal_id}.")
-        await synchronize_proposal_from_pass(proposal_id)
+    # The commissioning proposals don't depend on the regular proposals, so
+    # fetch them from PASS while the regular proposals are being synchronized.
+    commissioning_task = asyncio.create_task(
+        pass_service.get_commissioning_proposals_by_year(cycle_year)
+    )
+
+    logger.info(f"Synchronizing {len(proposals)} proposals for {cycle} cycle.")
+    try:
+        failed_proposals = await synchronize_proposals_from_pass(proposals)
+    except BaseException:
+        # Don't leave the commissioning proposals fetch running in the background.
+        commissioning_task.cancel()
+        raise
 
-    commissioning_proposals: list[
-        PassProposal
-    ] = await pass_service.get_commissioning_proposals_by_year(cycle_year)
+    commissioning_proposals: list[PassProposal] = await commissioning_task
     logger.info(
-        f"Synchronizing {len(proposals)} commissioning proposals for the year {cycle_year}."
+        f"Synchronizing {len(commissioning_proposals)} commissioning proposals for the year {cycle_year}."
+    )
+    failed_proposals += await synchronize_proposals_from_pass(
+        [proposal.Proposal_ID for proposal in commissioning_proposals]
     )
-    for proposal in commissioning_proposals:
-        logger.info(f"Synchronizing commissioning proposal {proposal.Proposal_ID}.")
-        await synchronize_proposal_from_pass(proposal.Proposal_ID)
 
     # Now update the cycle information for each proposal
     await update_proposals_with_cycle(cycle)
@@ -314,6 +535,11 @@ async def worker_synchronize_proposals_for_cycle_from_pass(cycle: str) -> None:
         f"Proposals for the {cycle} cycle synchronized in {time_taken.total_seconds():,.0f} seconds"
     )
 
+    if failed_proposals:
+        raise Exception(
+            f"Failed to synchronize {len(failed_proposals)} proposals for the {cycle} cycle: {failed_proposals}"
+        )
+
 
 async def worker_update_proposal_to_cycle_mapping(
     facility: FacilityName = FacilityName.nsls2,
@@ -337,7 +563,7 @@ async def worker_update_proposal_to_cycle_mapping(
             logger.info(
                 f"Updating proposals with information for cycle {individual_cycle.name} (from PASS)"
             )
-            await update_proposals_with_cycle(individual_cycle)
+            await update_proposals_with_cycle(individual_cycle.name)
 
     time_taken = datetime.datetime.now() - start_time
     logger.info(